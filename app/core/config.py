@@ -23,12 +23,57 @@ class Settings(BaseSettings):
 
     LAYER_ENDPOINT_URL, OPENAI_ENDPOINT_URL: str
         Эндпоинты сторонних апи сервисов
+
+    PROFILER_MAX_DURATION: int
+        Максимальная длительность сессии семплирующего профайлера (секунды).
+
+    SLOW_REQUEST_THRESHOLD_MS: int
+        Порог (мс), начиная с которого запрос попадает в буфер медленных запросов.
+
+    SLOW_REQUEST_BUFFER_SIZE: int
+        Размер кольцевого буфера медленных запросов.
+
+    OPEN_INDEX_RETENTION_HOURS: int
+        Сколько часов открытых жалоб держать в in-memory индексе. Запросы за больший
+        период обслуживаются из БД.
+
+    OPEN_INDEX_MAX_RECORDS: int
+        Максимальное количество записей в in-memory индексе открытых жалоб.
+
+    OPEN_INDEX_MAX_TEXT_BYTES: int
+        Максимальный суммарный размер текстов жалоб в индексе (байты). Худший случай памяти
+        индекса на процесс (в многопроцессном режиме — на каждый воркер):
+        OPEN_INDEX_MAX_TEXT_BYTES + OPEN_INDEX_MAX_RECORDS * ~300 байт, по умолчанию около 62 МиБ.
+
+    DATABASE_PATH: str
+        Путь к файлу SQLite.
+
+    MULTI_WORKER: bool
+        Многопроцессный режим: воркеры uvicorn только читают БД, а запись выполняет
+        отдельный процесс database.writer (см. run_multi_worker_app.bat).
+
+    WRITER_HOST, WRITER_PORT:
+        Адрес процесса записи (локальный TCP).
+
+    WRITER_BATCH_SIZE: int
+        Максимальное количество операций записи в одной транзакции процесса записи.
     '''
     COMPLAINT_API_KEY: str
     API_LAYER_KEY: str
     API_OPENAI_KEY: str
     LAYER_ENDPOINT_URL: str
     OPENAI_ENDPOINT_URL: str
+    PROFILER_MAX_DURATION: int = 60
+    SLOW_REQUEST_THRESHOLD_MS: int = 1000
+    SLOW_REQUEST_BUFFER_SIZE: int = 100
+    OPEN_INDEX_RETENTION_HOURS: int = 2
+    OPEN_INDEX_MAX_RECORDS: int = 100_000
+    OPEN_INDEX_MAX_TEXT_BYTES: int = 32 * 1024 * 1024
+    DATABASE_PATH: str = "./database/complaints.db"
+    MULTI_WORKER: bool = False
+    WRITER_HOST: str = "127.0.0.1"
+    WRITER_PORT: int = 8010
+    WRITER_BATCH_SIZE: int = 100
 
     model_config = SettingsConfigDict(env_file=".env.debug")
     
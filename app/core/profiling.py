@@ -0,0 +1,260 @@
+"""
+Модуль профилирования приложения.
+
+Содержит:
+- SamplingProfiler: статистический семплирующий профайлер. Отдельный поток с заданным
+  интервалом снимает стек потока event loop (или всех потоков) через sys._current_frames()
+  и агрегирует стеки в формат collapsed stacks (flamegraph.pl, speedscope, inferno).
+  Включается на фиксированное время, в остальное время накладных расходов нет.
+- SlowRequestRecorder: кольцевой буфер медленных запросов (тайминги по фазам и стек).
+- SlowRequestMiddleware: ASGI middleware, замеряющее длительность запросов и снимающее
+  асинхронный стек запроса, если он не уложился в порог.
+- profile_phase: контекстный менеджер для замера фаз обработки запроса.
+
+Используется в routers.admin.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+from core.config import settings
+
+
+_current_phases: ContextVar[Optional[dict]] = ContextVar("current_phases", default=None)
+
+
+@contextmanager
+def profile_phase(name: str):
+    """
+    Замеряет длительность фазы обработки текущего запроса (в миллисекундах).
+
+    Вне запроса (нет активного SlowRequestMiddleware) ничего не делает.
+    Повторные замеры одной фазы суммируются.
+
+    :param name: Название фазы.
+    """
+    phases = _current_phases.get()
+    if phases is None:
+        yield
+        return
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = (time.perf_counter() - started) * 1000
+        phases[name] = phases.get(name, 0.0) + elapsed
+
+
+def _format_frame(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+
+
+def _collapse_stack(frame) -> str:
+    """Сворачивает стек кадра в строку вида 'outer;...;inner'."""
+    names = []
+    while frame is not None:
+        names.append(_format_frame(frame))
+        frame = frame.f_back
+    names.reverse()
+    return ";".join(names)
+
+
+class ProfilerBusyError(RuntimeError):
+    """Профайлер уже запущен."""
+
+
+class SamplingProfiler:
+    """
+    Статистический семплирующий профайлер.
+
+    Одновременно может выполняться только одна сессия профилирования.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._lock.locked()
+
+    async def profile(
+            self,
+            duration: float,
+            interval: float = 0.005,
+            all_threads: bool = False
+        ) -> tuple[str, int]:
+        """
+        Профилирует приложение в течение duration секунд.
+
+        Вызывается из event loop: по умолчанию семплируется поток, в котором он работает.
+
+        :param duration: Длительность профилирования (секунды).
+        :param interval: Интервал между снимками стека (секунды).
+        :param all_threads: Семплировать все потоки (стек предваряется именем потока).
+        :return: Collapsed stacks (строки 'frame;frame;frame count') и количество снимков.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("Profiler is already running")
+
+        try:
+            target = None if all_threads else threading.get_ident()
+            stacks = Counter()
+            stop = threading.Event()
+            sampler = threading.Thread(
+                target=self._sample,
+                args=(stacks, stop, interval, target),
+                name="sampling-profiler",
+                daemon=True
+            )
+            sampler.start()
+            try:
+                await asyncio.sleep(duration)
+            finally:
+                stop.set()
+                await asyncio.to_thread(sampler.join)
+        finally:
+            self._lock.release()
+
+        lines = [f"{stack} {count}" for stack, count in stacks.most_common()]
+        return "\n".join(lines) + ("\n" if lines else ""), sum(stacks.values())
+
+    @staticmethod
+    def _sample(stacks: Counter, stop: threading.Event, interval: float, target: Optional[int]):
+        own_ident = threading.get_ident()
+        while not stop.wait(interval):
+            frames = sys._current_frames()
+            if target is not None:
+                frame = frames.get(target)
+                if frame is not None:
+                    stacks[_collapse_stack(frame)] += 1
+                continue
+
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in frames.items():
+                if ident == own_ident:
+                    continue
+                thread_name = names.get(ident, str(ident))
+                stacks[f"{thread_name};{_collapse_stack(frame)}"] += 1
+
+
+def _task_stack(task: asyncio.Task) -> list[str]:
+    """
+    Возвращает асинхронный стек задачи: цепочку корутин по cr_await от корня до места ожидания.
+
+    asyncio.Task.get_stack() для приостановленной задачи возвращает только верхний кадр,
+    поэтому цепочку await проходим вручную.
+    """
+    frames = []
+    awaitable = task.get_coro()
+    while awaitable is not None:
+        frame = getattr(awaitable, "cr_frame", None) or getattr(awaitable, "gi_frame", None)
+        if frame is not None:
+            frames.append((frame, frame.f_lineno))
+        next_awaitable = getattr(awaitable, "cr_await", None)
+        if next_awaitable is None:
+            next_awaitable = getattr(awaitable, "gi_yieldfrom", None)
+        if next_awaitable is None and frame is None:
+            break
+        awaitable = next_awaitable
+
+    return [line.rstrip("\n") for line in traceback.format_list(traceback.StackSummary.extract(frames))]
+
+
+class SlowRequestRecorder:
+    """
+    Кольцевой буфер медленных запросов.
+
+    Каждая запись содержит метод, путь, код ответа, общую длительность, тайминги по фазам
+    (см. profile_phase) и асинхронный стек запроса в момент превышения порога.
+    """
+
+    def __init__(self, threshold_ms: float, maxlen: int):
+        self.threshold_ms = threshold_ms
+        self._records = deque(maxlen=maxlen)
+
+    def add(self, record: dict):
+        self._records.append(record)
+
+    def records(self) -> list[dict]:
+        """Записи от самой новой к самой старой."""
+        return list(reversed(self._records))
+
+    def clear(self):
+        self._records.clear()
+
+
+class SlowRequestMiddleware:
+    """
+    ASGI middleware для записи медленных запросов в SlowRequestRecorder.
+
+    Реализовано как чистое ASGI middleware (а не BaseHTTPMiddleware), чтобы эндпоинт
+    выполнялся в той же задаче asyncio и его стек можно было снять по таймеру.
+    Служебные маршруты /admin/ (в т.ч. сам профайлер) не записываются.
+    """
+
+    def __init__(self, app, recorder: SlowRequestRecorder = None):
+        self.app = app
+        self.recorder = recorder or slow_request_recorder
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith("/admin/"):
+            await self.app(scope, receive, send)
+            return
+
+        phases = {}
+        snapshot = {}
+        status_code = None
+        token = _current_phases.set(phases)
+
+        def capture_stack(task: asyncio.Task):
+            snapshot["stack"] = _task_stack(task)
+
+        loop = asyncio.get_running_loop()
+        timer = loop.call_later(
+            self.recorder.threshold_ms / 1000,
+            capture_stack,
+            asyncio.current_task()
+        )
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        started_at = datetime.now(timezone.utc)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            timer.cancel()
+            _current_phases.reset(token)
+
+            if duration_ms >= self.recorder.threshold_ms:
+                self.recorder.add({
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": status_code,
+                    "started_at": started_at.isoformat(),
+                    "duration_ms": round(duration_ms, 3),
+                    "phases": {name: round(ms, 3) for name, ms in phases.items()},
+                    "stack": snapshot.get("stack")
+                })
+
+
+profiler = SamplingProfiler()
+slow_request_recorder = SlowRequestRecorder(
+    threshold_ms=settings.SLOW_REQUEST_THRESHOLD_MS,
+    maxlen=settings.SLOW_REQUEST_BUFFER_SIZE
+)
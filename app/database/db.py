@@ -10,17 +10,23 @@
 - Получение асинхронной сессии для использования в приложении.
 
 Параметры:
-- DATABASE_URL: строка подключения к базе данных (по умолчанию SQLite файл в ./database/complaints.db).
+- DATABASE_URL: строка подключения к базе данных (по умолчанию SQLite файл в ./database/complaints.db,
+  см. DATABASE_PATH в core.config).
+- READONLY_DATABASE_URL: подключение только на чтение. Используется воркерами в многопроцессном
+  режиме (MULTI_WORKER), где запись выполняет отдельный процесс database.writer.
 """
 
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import declarative_base
 
+from core.config import settings
 
-db_path = "./database/complaints.db"
+
+db_path = settings.DATABASE_PATH
 DATABASE_URL = f"sqlite+aiosqlite:///{db_path}"
+READONLY_DATABASE_URL = f"sqlite+aiosqlite:///file:{db_path}?mode=ro&uri=true"
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+engine = create_async_engine(READONLY_DATABASE_URL if settings.MULTI_WORKER else DATABASE_URL, echo=True)
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 Base = declarative_base()
 
@@ -41,4 +47,4 @@ async def get_db():
     Используется как dependency в FastAPI.
     """
     async with AsyncSessionLocal() as session:
-        yield session
\ No newline at end of file
+        yield session
@@ -4,19 +4,25 @@
 Содержит:
 - Определения моделей и перечислений (Enums) для статусов, тональностей и категорий жалоб.
 - CRUD-функции для создания, обновления и получения жалоб.
+- Заполнение и сверку in-memory индекса открытых жалоб (см. database.open_index).
+- Сериализацию жалоб для многопроцессного режима, в котором запись выполняет
+  отдельный процесс (см. database.writer, database.writer_client).
 - Асинхронная работа с базой данных через SQLAlchemy AsyncSession.
 
 Используется в сервисах FastAPI для хранения и обработки жалоб.
 """
 
 import enum
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from typing import Optional
 
 from sqlalchemy import Column, Integer, String, DateTime, Enum, func, select
 from sqlalchemy.exc import SQLAlchemyError, NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from .db import Base
+from .open_index import OpenComplaintRecord, open_complaints_index, to_utc_naive
+from .writer_client import writer_client
 
 
 class StatusEnum(str, enum.Enum):
@@ -48,36 +54,109 @@ class Complaint(Base):
     category = Column(Enum(CategoryEnum), default=CategoryEnum.other)
 
 
-async def create_complaint_record(
-        db: AsyncSession,
+def build_complaint(
         analysis_result: dict,
         text: str,
         category: CategoryEnum = CategoryEnum.other,
         status: StatusEnum = StatusEnum.open
     ) -> Complaint:
     """
-    Создает новую запись жалобы в базе данных.
+    Создает (не сохраняя) объект жалобы по результату анализа тональности.
 
-    :param db: Асинхронная сессия базы данных.
     :param analysis_result: Результат анализа тональности (словарь).
     :param text: Текст жалобы.
     :param category: Категория жалобы.
     :param status: Статус жалобы.
-    :return: Созданная жалоба.
+    :return: Новая жалоба.
     """
     sentiment_str = analysis_result.get("sentiment", "NEUTRAL").lower()
     sentiment = SentimentEnum[sentiment_str.lower()] if sentiment_str.lower() in SentimentEnum.__members__ else SentimentEnum.neutral
 
-    complaint = Complaint(
+    return Complaint(
         text=text,
         sentiment=sentiment,
         category=category,
         status=status
     )
 
+
+def resolve_category(new_category: str) -> Optional[CategoryEnum]:
+    """Категория по строковому значению (None, если такой категории нет)."""
+    return next(
+        (member for member in CategoryEnum if member.value == new_category),
+        None
+    )
+
+
+def complaint_to_dict(complaint: Complaint) -> dict:
+    """Сериализует жалобу для передачи между процессами (см. database.writer)."""
+    return {
+        "id": complaint.id,
+        "text": complaint.text,
+        "status": complaint.status.value if complaint.status else None,
+        "timestamp": complaint.timestamp.isoformat() if complaint.timestamp else None,
+        "sentiment": complaint.sentiment.value if complaint.sentiment else None,
+        "category": complaint.category.value if complaint.category else None
+    }
+
+
+def complaint_from_dict(data: dict) -> Complaint:
+    """
+    Восстанавливает жалобу из complaint_to_dict (объект не привязан к сессии).
+
+    Пустые id и timestamp не передаются, чтобы при вставке их проставила БД.
+    """
+    fields = {
+        "text": data["text"],
+        "status": StatusEnum(data["status"]) if data["status"] else None,
+        "sentiment": SentimentEnum(data["sentiment"]) if data["sentiment"] else None,
+        "category": CategoryEnum(data["category"]) if data["category"] else None
+    }
+    if data["id"] is not None:
+        fields["id"] = data["id"]
+    if data["timestamp"] is not None:
+        fields["timestamp"] = datetime.fromisoformat(data["timestamp"])
+    return Complaint(**fields)
+
+
+def apply_complaint_event(data: dict):
+    """Применяет к in-memory индексу событие об изменении жалобы от процесса записи."""
+    complaint = complaint_from_dict(data)
+    if complaint.status == StatusEnum.open:
+        open_complaints_index.add(complaint)
+    else:
+        open_complaints_index.discard(complaint.id)
+
+
+async def create_complaint_record(
+        db: AsyncSession,
+        analysis_result: dict,
+        text: str,
+        category: CategoryEnum = CategoryEnum.other,
+        status: StatusEnum = StatusEnum.open
+    ) -> Complaint:
+    """
+    Создает новую запись жалобы в базе данных.
+
+    В многопроцессном режиме запись выполняет процесс database.writer.
+
+    :param db: Асинхронная сессия базы данных.
+    :param analysis_result: Результат анализа тональности (словарь).
+    :param text: Текст жалобы.
+    :param category: Категория жалобы.
+    :param status: Статус жалобы.
+    :return: Созданная жалоба.
+    """
+    complaint = build_complaint(analysis_result, text, category, status)
+
+    if writer_client.enabled:
+        data = await writer_client.call("create", complaint=complaint_to_dict(complaint))
+        return complaint_from_dict(data)
+
     try:
         db.add(complaint)
         await db.commit()
+        open_complaints_index.add(complaint)
         return complaint
     except SQLAlchemyError:
         await db.rollback()
@@ -92,11 +171,26 @@ async def update_complaint_category(
     """
     Обновляет категорию существующей жалобы.
 
+    В многопроцессном режиме запись выполняет процесс database.writer.
+
     :param db: Асинхронная сессия базы данных.
     :param complaint_id: ID жалобы.
     :param new_category: Новая категория (строка).
     :return: Обновленная жалоба.
     """
+    category = resolve_category(new_category)
+
+    if writer_client.enabled:
+        try:
+            data = await writer_client.call(
+                "update_category",
+                complaint_id=complaint_id,
+                category=category.value if category else None
+            )
+        except LookupError as e:
+            raise NoResultFound(str(e)) from e
+        return complaint_from_dict(data)
+
     try:
         result = await db.execute(
             select(Complaint).where(Complaint.id == complaint_id)
@@ -106,12 +200,9 @@ async def update_complaint_category(
         if complaint is None:
             raise NoResultFound(f"Complaint with id {complaint_id} not found")
 
-        category = next(
-            (member for member in CategoryEnum if member.value == new_category),
-            None
-        )
         complaint.category = category
         await db.commit()
+        open_complaints_index.update_category(complaint.id, complaint.category)
         return complaint
     except SQLAlchemyError:
         await db.rollback()
@@ -122,16 +213,23 @@ async def get_recent_open_complaint_records(
         db: AsyncSession,
         current_time: datetime,
         hours: int = 1
-    ) -> list[Complaint]:
+    ) -> list[Complaint | OpenComplaintRecord]:
     """
     Получение жалоб со статусом 'open' за указанный период времени (по умолчанию за последний час).
 
+    Если период целиком покрыт in-memory индексом, ответ формируется из памяти
+    (записи OpenComplaintRecord с теми же атрибутами), иначе — запросом к БД.
+
     :param db: Сессия базы данных.
-    :param current_time: Время, от которого считается интервал.
+    :param current_time: Время, от которого считается интервал (с часовым поясом или naive UTC).
     :param hours: Количество часов для поиска (по умолчанию 1 час).
     :return: Список жалоб.
     """
-    start_time = current_time - timedelta(hours=hours)
+    # Время в БД хранится как naive UTC: приводим к нему и запрос к индексу, и запрос к БД
+    start_time = to_utc_naive(current_time - timedelta(hours=hours))
+
+    if open_complaints_index.covers(start_time):
+        return open_complaints_index.since(start_time)
 
     stmt = select(Complaint).where(
         Complaint.status == 'open',
@@ -146,11 +244,20 @@ async def close_complaint_status(db: AsyncSession, complaint_id: int, new_status
     """
     Закрывает жалобу, обновляя её статус.
 
+    В многопроцессном режиме запись выполняет процесс database.writer.
+
     :param db: Асинхронная сессия базы данных.
     :param complaint_id: ID жалобы.
     :param new_status: Новый статус (из StatusEnum).
     :return: Обновленная жалоба.
     """
+    if writer_client.enabled:
+        try:
+            data = await writer_client.call("close", complaint_id=complaint_id, status=new_status.value)
+        except LookupError as e:
+            raise ValueError(str(e)) from e
+        return complaint_from_dict(data)
+
     try:
         result = await db.execute(select(Complaint).where(Complaint.id == complaint_id))
         complaint = result.scalar_one_or_none()
@@ -161,7 +268,84 @@ async def close_complaint_status(db: AsyncSession, complaint_id: int, new_status
         complaint.status = new_status
         await db.commit()
         await db.refresh(complaint)
+        if complaint.status == StatusEnum.open:
+            open_complaints_index.add(complaint)
+        else:
+            open_complaints_index.discard(complaint.id)
         return complaint
     except SQLAlchemyError:
         await db.rollback()
-        raise
\ No newline at end of file
+        raise
+
+
+async def _select_open_complaints_since(db: AsyncSession, start_time: datetime) -> list[Complaint]:
+    stmt = select(Complaint).where(
+        Complaint.status == 'open',
+        Complaint.timestamp >= start_time
+    ).order_by(Complaint.id)
+    result = await db.execute(stmt)
+    return result.scalars().all()
+
+
+async def warm_open_complaints_index(db: AsyncSession):
+    """
+    Заполняет in-memory индекс открытых жалоб из базы данных.
+
+    Вызывается при старте приложения, а также для пересборки индекса после расхождения с БД.
+
+    :param db: Асинхронная сессия базы данных.
+    """
+    coverage_start = datetime.now(timezone.utc).replace(tzinfo=None) - open_complaints_index.retention
+    open_complaints_index.begin_load()
+    try:
+        complaints = await _select_open_complaints_since(db, coverage_start)
+    except Exception:
+        open_complaints_index.cancel_load()
+        raise
+    open_complaints_index.load(complaints, coverage_start)
+
+
+async def check_open_complaints_index(db: AsyncSession, repair: bool = False) -> dict:
+    """
+    Сверяет in-memory индекс открытых жалоб с базой данных.
+
+    :param db: Асинхронная сессия базы данных.
+    :param repair: Пересобрать индекс из БД при расхождении.
+    :return: Отчёт: id отсутствующих в индексе (missing), лишних (extra)
+             и отличающихся по полям (mismatched) жалоб.
+    """
+    if not open_complaints_index.ready:
+        if repair:
+            await warm_open_complaints_index(db)
+        return {"consistent": False, "reason": "index is not warmed", "repaired": repair}
+
+    open_complaints_index.evict()
+    coverage_start = open_complaints_index.coverage_start
+    expected = {c.id: c for c in await _select_open_complaints_since(db, coverage_start)}
+    actual = {r.id: r for r in open_complaints_index.since(coverage_start)}
+
+    missing = sorted(expected.keys() - actual.keys())
+    extra = sorted(actual.keys() - expected.keys())
+    mismatched = sorted(
+        complaint_id
+        for complaint_id in expected.keys() & actual.keys()
+        if (
+            expected[complaint_id].category != actual[complaint_id].category
+            or expected[complaint_id].sentiment != actual[complaint_id].sentiment
+            or to_utc_naive(expected[complaint_id].timestamp) != actual[complaint_id].timestamp
+        )
+    )
+    consistent = not (missing or extra or mismatched)
+
+    if repair and not consistent:
+        await warm_open_complaints_index(db)
+
+    return {
+        "consistent": consistent,
+        "coverage_start": coverage_start.isoformat(),
+        "checked": len(expected),
+        "missing": missing,
+        "extra": extra,
+        "mismatched": mismatched,
+        "repaired": repair and not consistent
+    }
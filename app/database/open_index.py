@@ -0,0 +1,257 @@
+"""
+Модуль in-memory индекса открытых жалоб.
+
+n8n запрашивает только открытые жалобы за последний час, поэтому горячий набор держится
+в памяти процесса и отдаётся без обращения к SQLite.
+
+Содержит:
+- OpenComplaintRecord: компактная запись жалобы (__slots__), независимая от сессии SQLAlchemy.
+- OpenComplaintsIndex: упорядоченный по времени индекс, разбитый на поминутные корзины.
+- open_complaints_index: экземпляр индекса приложения.
+
+Индекс гарантирует полноту только начиная с coverage_start: всё, что старше, вытеснено
+(по возрасту или по лимиту размера), и такие запросы должны идти в базу данных.
+Все временные метки хранятся как naive UTC (так их хранит SQLite через CURRENT_TIMESTAMP).
+
+Заполнение и сверка с БД — в database.models (warm_open_complaints_index, check_open_complaints_index).
+"""
+
+import sys
+from bisect import bisect_left, insort
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from core.config import settings
+
+
+EPOCH = datetime(1970, 1, 1)
+MINUTE = timedelta(minutes=1)
+
+
+def to_utc_naive(value: datetime) -> datetime:
+    """Приводит datetime к naive UTC. Naive значения считаются уже заданными в UTC."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _minute_key(value: datetime) -> int:
+    return (value - EPOCH) // MINUTE
+
+
+class OpenComplaintRecord:
+    """Компактная запись открытой жалобы. Атрибуты совпадают с моделью Complaint."""
+    __slots__ = ("id", "text", "status", "timestamp", "sentiment", "category")
+
+    def __init__(self, id, text, status, timestamp, sentiment, category):
+        self.id = id
+        self.text = text
+        self.status = status
+        self.timestamp = timestamp
+        self.sentiment = sentiment
+        self.category = category
+
+    @classmethod
+    def from_model(cls, complaint) -> "OpenComplaintRecord":
+        return cls(
+            id=complaint.id,
+            text=complaint.text,
+            status=complaint.status,
+            timestamp=to_utc_naive(complaint.timestamp),
+            sentiment=complaint.sentiment,
+            category=complaint.category
+        )
+
+
+class OpenComplaintsIndex:
+    """
+    Индекс открытых жалоб, упорядоченный по времени.
+
+    Жалобы лежат в поминутных корзинах (dict id -> запись, порядок вставки),
+    ключи корзин — в отсортированном списке. Для закрытия и смены категории
+    по id используется словарь id -> ключ корзины.
+
+    Объём памяти ограничен тремя параметрами:
+    - retention: жалобы старше (now - retention) вытесняются целыми корзинами;
+    - max_records: при превышении вытесняются самые старые корзины;
+    - max_text_bytes: то же для суммарного размера текстов жалоб (sys.getsizeof строк),
+      так как длина текста не ограничена и именно он занимает основную память.
+    Худший случай на процесс: max_text_bytes + max_records * ~300 байт (запись, id, timestamp,
+    служебные словари); при значениях по умолчанию — около 32 + 30 МиБ.
+
+    Все операции синхронные и выполняются в потоке event loop, блокировки не нужны.
+    Заполнение из БД асинхронное, поэтому изменения между begin_load() и load()
+    записываются и применяются поверх снимка.
+    """
+
+    def __init__(self, retention: timedelta, max_records: int, max_text_bytes: int):
+        self.retention = retention
+        self.max_records = max_records
+        self.max_text_bytes = max_text_bytes
+        self._text_bytes = 0
+        self._keys: list[int] = []
+        self._buckets: dict[int, dict[int, OpenComplaintRecord]] = {}
+        self._bucket_by_id: dict[int, int] = {}
+        self.coverage_start: Optional[datetime] = None
+        self._pending: Optional[list] = None
+
+    @property
+    def ready(self) -> bool:
+        """Индекс заполнен из БД и может отвечать на запросы."""
+        return self.coverage_start is not None
+
+    def __len__(self) -> int:
+        return len(self._bucket_by_id)
+
+    def begin_load(self):
+        """
+        Начинает запись изменений перед снимком БД для load().
+
+        Вызывается до запроса снимка: изменения, закоммиченные во время запроса (события
+        от процесса записи или запись в этом процессе), попадут в буфер и будут применены
+        поверх снимка, даже если сам снимок их уже не увидел.
+        """
+        if self._pending is None:
+            self._pending = []
+
+    def cancel_load(self):
+        """Прекращает запись изменений (снимок БД получить не удалось)."""
+        self._pending = None
+
+    def load(self, complaints, coverage_start: datetime):
+        """
+        Полностью заменяет содержимое индекса и применяет изменения, записанные после begin_load().
+
+        :param complaints: Открытые жалобы с timestamp >= coverage_start.
+        :param coverage_start: Время, начиная с которого индекс полон.
+        """
+        pending, self._pending = self._pending or [], None
+        self.reset()
+        self.coverage_start = to_utc_naive(coverage_start)
+        for complaint in complaints:
+            self._insert(OpenComplaintRecord.from_model(complaint))
+        for operation, *args in pending:
+            operation(*args)
+        self.evict()
+
+    def reset(self):
+        """Очищает индекс; до следующего load() запросы обслуживаются из БД."""
+        self._keys = []
+        self._buckets = {}
+        self._bucket_by_id = {}
+        self._text_bytes = 0
+        self.coverage_start = None
+
+    def add(self, complaint):
+        """Добавляет (или заменяет) открытую жалобу."""
+        record = OpenComplaintRecord.from_model(complaint)
+        if self._pending is not None:
+            self._pending.append((self.add, record))
+        if not self.ready:
+            return
+        self._remove(record.id)
+        if record.timestamp < self.coverage_start:
+            return
+        self._insert(record)
+        self.evict()
+
+    def update_category(self, complaint_id: int, category):
+        if self._pending is not None:
+            self._pending.append((self.update_category, complaint_id, category))
+        record = self._get(complaint_id)
+        if record is not None:
+            record.category = category
+
+    def discard(self, complaint_id: int):
+        """Удаляет жалобу из индекса (например, после закрытия)."""
+        if self._pending is not None:
+            self._pending.append((self.discard, complaint_id))
+        self._remove(complaint_id)
+
+    def covers(self, start_time: datetime) -> bool:
+        """Может ли индекс полностью ответить на запрос жалоб с timestamp >= start_time."""
+        if not self.ready:
+            return False
+        self.evict()
+        return to_utc_naive(start_time) >= self.coverage_start
+
+    def since(self, start_time: datetime) -> list[OpenComplaintRecord]:
+        """Открытые жалобы с timestamp >= start_time (в порядке времени)."""
+        start_time = to_utc_naive(start_time)
+        position = bisect_left(self._keys, _minute_key(start_time))
+        result = []
+        for key in self._keys[position:]:
+            result.extend(
+                record for record in self._buckets[key].values()
+                if record.timestamp >= start_time
+            )
+        return result
+
+    def evict(self, now: Optional[datetime] = None):
+        """Вытесняет корзины старше retention и самые старые корзины сверх max_records / max_text_bytes."""
+        if not self.ready:
+            return
+        now = to_utc_naive(now or datetime.now(timezone.utc))
+        cutoff = _minute_key(now - self.retention)
+
+        while self._keys and (
+                self._keys[0] < cutoff
+                or len(self._bucket_by_id) > self.max_records
+                or self._text_bytes > self.max_text_bytes
+            ):
+            key = self._keys[0]
+            for complaint_id, record in self._buckets[key].items():
+                del self._bucket_by_id[complaint_id]
+                self._text_bytes -= sys.getsizeof(record.text)
+            self._drop_bucket(key)
+            self.coverage_start = max(self.coverage_start, EPOCH + (key + 1) * MINUTE)
+
+        self.coverage_start = max(self.coverage_start, EPOCH + cutoff * MINUTE)
+
+    def stats(self) -> dict:
+        return {
+            "ready": self.ready,
+            "records": len(self),
+            "buckets": len(self._keys),
+            "coverage_start": self.coverage_start.isoformat() if self.coverage_start else None,
+            "retention_seconds": self.retention.total_seconds(),
+            "max_records": self.max_records,
+            "text_bytes": self._text_bytes,
+            "max_text_bytes": self.max_text_bytes
+        }
+
+    def _get(self, complaint_id: int) -> Optional[OpenComplaintRecord]:
+        key = self._bucket_by_id.get(complaint_id)
+        if key is None:
+            return None
+        return self._buckets[key][complaint_id]
+
+    def _remove(self, complaint_id: int):
+        key = self._bucket_by_id.pop(complaint_id, None)
+        if key is None:
+            return
+        bucket = self._buckets[key]
+        self._text_bytes -= sys.getsizeof(bucket.pop(complaint_id).text)
+        if not bucket:
+            self._drop_bucket(key)
+
+    def _insert(self, record: OpenComplaintRecord):
+        key = _minute_key(record.timestamp)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = {}
+            insort(self._keys, key)
+        bucket[record.id] = record
+        self._bucket_by_id[record.id] = key
+        self._text_bytes += sys.getsizeof(record.text)
+
+    def _drop_bucket(self, key: int):
+        del self._buckets[key]
+        self._keys.pop(bisect_left(self._keys, key))
+
+
+open_complaints_index = OpenComplaintsIndex(
+    retention=timedelta(hours=settings.OPEN_INDEX_RETENTION_HOURS),
+    max_records=settings.OPEN_INDEX_MAX_RECORDS,
+    max_text_bytes=settings.OPEN_INDEX_MAX_TEXT_BYTES
+)
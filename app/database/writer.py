@@ -0,0 +1,194 @@
+"""
+Процесс записи для многопроцессного режима (MULTI_WORKER).
+
+SQLite допускает только одного писателя, поэтому при нескольких воркерах uvicorn все записи
+(создание жалобы, смена категории, закрытие) выполняет один процесс:
+
+- воркеры подключаются к нему по локальному TCP (database.writer_client) и присылают операции;
+- операции складываются в очередь и применяются пачками: всё, что накопилось, пока
+  выполнялась предыдущая транзакция (но не больше WRITER_BATCH_SIZE), коммитится одной транзакцией;
+  каждая операция выполняется в своём SAVEPOINT, так что ошибка одной операции не отменяет остальные;
+- после коммита всем воркерам рассылаются события об изменённых жалобах (для in-memory индекса),
+  затем отправителям — ответы.
+
+База переводится в режим WAL, чтобы воркеры читали через read-only подключения, не блокируясь записью.
+
+Запуск (из папки app):
+    python -m database.writer
+"""
+
+import asyncio
+import json
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+
+from core.config import settings
+from .db import Base, DATABASE_URL
+from .models import Complaint, StatusEnum, CategoryEnum, complaint_from_dict, complaint_to_dict
+from .writer_client import WriterClient
+
+
+class WriterServer:
+    """
+    Сервер процесса записи.
+
+    :param engine: Движок SQLAlchemy с доступом на запись.
+    :param batch_size: Максимальное количество операций в одной транзакции.
+    """
+
+    def __init__(self, engine, batch_size: int):
+        self.engine = engine
+        self.batch_size = batch_size
+        self._session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._connections: set[asyncio.StreamWriter] = set()
+
+    async def init_db(self):
+        """Создаёт таблицы (режим WAL включается при подключении, см. create_writer_engine)."""
+        async with self.engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async def serve(self, host: str, port: int):
+        await self.init_db()
+        server = await asyncio.start_server(
+            self._handle_connection, host, port, limit=WriterClient.STREAM_LIMIT
+        )
+        print(f"Writer process is listening on {host}:{port}")
+        async with server:
+            await asyncio.gather(server.serve_forever(), self._run_batches())
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._connections.add(writer)
+        try:
+            while line := await reader.readline():
+                self._queue.put_nowait((json.loads(line), writer))
+        except ConnectionError:
+            pass
+        finally:
+            self._connections.discard(writer)
+            writer.close()
+
+    async def _run_batches(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            await self._apply_batch(batch)
+
+    async def _apply_batch(self, batch: list[tuple[dict, asyncio.StreamWriter]]):
+        replies = []
+        changed = {}
+
+        async with self._session_factory() as db:
+            for message, connection in batch:
+                # Каждая операция — в своём SAVEPOINT: ошибка одной не отменяет остальные в пачке
+                try:
+                    async with db.begin_nested():
+                        complaint = await self._apply(db, message)
+                except Exception as e:
+                    replies.append((connection, {"id": message["id"], "ok": False, "error": "db", "detail": str(e)}))
+                    continue
+
+                if complaint is None:
+                    replies.append((connection, {
+                        "id": message["id"],
+                        "ok": False,
+                        "error": "not_found",
+                        "detail": f"Complaint with id {message['complaint_id']} not found"
+                    }))
+                else:
+                    changed[id(complaint)] = complaint
+                    replies.append((connection, {"id": message["id"], "ok": True, "complaint": complaint}))
+
+            try:
+                await db.commit()
+
+                # timestamp новых жалоб приходит через INSERT ... RETURNING. Перечитывать нужно только
+                # объекты, истёкшие при откате SAVEPOINT упавшей операции над той же жалобой
+                for complaint in changed.values():
+                    if inspect(complaint).expired_attributes:
+                        await db.refresh(complaint)
+            except Exception as e:
+                # Не удался сам коммит: откатывается вся пачка, процесс записи продолжает работу
+                await db.rollback()
+                for message, connection in batch:
+                    self._send(connection, {"id": message["id"], "ok": False, "error": "db", "detail": str(e)})
+                await self._drain({connection for _, connection in batch})
+                return
+
+        serialized = {key: complaint_to_dict(complaint) for key, complaint in changed.items()}
+        for connection in self._connections:
+            for data in serialized.values():
+                self._send(connection, {"event": "complaint", "complaint": data})
+        for connection, reply in replies:
+            if reply["ok"]:
+                reply["complaint"] = serialized[id(reply["complaint"])]
+            self._send(connection, reply)
+        await self._drain(set(self._connections) | {connection for connection, _ in replies})
+
+    @staticmethod
+    async def _apply(db: AsyncSession, message: dict):
+        """Применяет операцию без коммита. Возвращает жалобу или None, если она не найдена."""
+        if message["op"] == "create":
+            complaint = complaint_from_dict(message["complaint"])
+            db.add(complaint)
+            await db.flush()
+            return complaint
+
+        result = await db.execute(select(Complaint).where(Complaint.id == message["complaint_id"]))
+        complaint = result.scalar_one_or_none()
+        if complaint is None:
+            return None
+
+        if message["op"] == "update_category":
+            complaint.category = CategoryEnum(message["category"]) if message["category"] else None
+        elif message["op"] == "close":
+            complaint.status = StatusEnum(message["status"])
+        else:
+            raise ValueError(f"Unknown writer operation: {message['op']}")
+        return complaint
+
+    @staticmethod
+    def _send(connection: asyncio.StreamWriter, message: dict):
+        if not connection.is_closing():
+            connection.write(json.dumps(message).encode() + b"\n")
+
+    @staticmethod
+    async def _drain(connections):
+        for connection in connections:
+            try:
+                await connection.drain()
+            except ConnectionError:
+                pass
+
+
+def create_writer_engine():
+    """
+    Движок с доступом на запись.
+
+    - journal_mode=WAL: воркеры читают через read-only подключения, не блокируясь записью;
+      synchronous=NORMAL безопасен в режиме WAL и ускоряет коммиты.
+    - Транзакциями управляет SQLAlchemy (BEGIN на событии begin), а не драйвер: иначе pysqlite
+      не поддерживает SAVEPOINT, которые используются для изоляции операций внутри пачки.
+    """
+    writer_engine = create_async_engine(DATABASE_URL)
+
+    @event.listens_for(writer_engine.sync_engine, "connect")
+    def set_sqlite_pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.close()
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(writer_engine.sync_engine, "begin")
+    def do_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+
+    return writer_engine
+
+
+if __name__ == "__main__":
+    server = WriterServer(create_writer_engine(), settings.WRITER_BATCH_SIZE)
+    asyncio.run(server.serve(settings.WRITER_HOST, settings.WRITER_PORT))
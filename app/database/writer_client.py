@@ -0,0 +1,179 @@
+"""
+Клиент процесса записи (database.writer) для многопроцессного режима.
+
+В режиме MULTI_WORKER каждый воркер uvicorn открывает к процессу записи одно TCP-соединение
+на 127.0.0.1 (работает и на Windows) и мультиплексирует по нему запросы: сообщения — JSON,
+по одному в строке, ответы сопоставляются с запросами по полю id.
+
+По тому же соединению процесс записи рассылает всем воркерам события об изменённых жалобах,
+чтобы каждый воркер поддерживал свой in-memory индекс открытых жалоб (database.open_index).
+Событие об изменении всегда приходит раньше ответа на запрос, который его вызвал.
+
+При потере соединения клиент переподключается в фоне с экспоненциальной задержкой
+(индекс при этом сбрасывается и заново заполняется из БД в on_connect), а операции
+записи до восстановления соединения сразу завершаются ошибкой WriterError.
+"""
+
+import asyncio
+import itertools
+import json
+from typing import Awaitable, Callable, Optional
+
+from core.config import settings
+
+
+class WriterError(Exception):
+    """Процесс записи недоступен или не смог выполнить запись."""
+
+
+class WriterClient:
+    """
+    Асинхронный клиент процесса записи.
+
+    :param host: Адрес процесса записи.
+    :param port: Порт процесса записи.
+    :param enabled: Включён ли многопроцессный режим (иначе запись идёт напрямую в БД).
+    """
+
+    CONNECT_ATTEMPTS = 20
+    CONNECT_RETRY_DELAY = 0.5
+    RECONNECT_MAX_DELAY = 10
+    STREAM_LIMIT = 16 * 1024 * 1024
+
+    def __init__(self, host: str, port: int, enabled: bool):
+        self.host = host
+        self.port = port
+        self.enabled = enabled
+        self.on_event: Optional[Callable[[dict], None]] = None
+        self.on_connect: Optional[Callable[[], Awaitable[None]]] = None
+        self.on_disconnect: Optional[Callable[[], None]] = None
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future] = {}
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._listener: Optional[asyncio.Task] = None
+        self._reconnector: Optional[asyncio.Task] = None
+        self._closed = False
+
+    @property
+    def connected(self) -> bool:
+        return self._writer is not None and not self._writer.is_closing()
+
+    async def connect(self):
+        """
+        Подключается к процессу записи при старте приложения (с повторными попытками,
+        пока он запускается) и вызывает on_connect.
+
+        После потери соединения переподключение выполняется в фоне (см. _reconnect).
+        """
+        self._closed = False
+        for attempt in range(self.CONNECT_ATTEMPTS):
+            try:
+                await self._open()
+                return
+            except OSError as e:
+                if attempt == self.CONNECT_ATTEMPTS - 1:
+                    raise WriterError(f"Writer process is unavailable at {self.host}:{self.port}") from e
+                await asyncio.sleep(self.CONNECT_RETRY_DELAY)
+
+    async def close(self):
+        self._closed = True
+        for task in (self._reconnector, self._listener):
+            if task is not None:
+                task.cancel()
+        self._reconnector = None
+        self._listener = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def call(self, op: str, **payload) -> dict:
+        """
+        Отправляет операцию записи и ждёт результата.
+
+        Пока соединения нет, сразу завершается ошибкой: запрос не ждёт переподключения.
+
+        :param op: Операция: create, update_category, close.
+        :param payload: Аргументы операции.
+        :return: Жалоба после записи (словарь полей).
+        :raises LookupError: Жалоба не найдена.
+        :raises WriterError: Процесс записи недоступен или запись не удалась.
+        """
+        if not self.connected:
+            raise WriterError(f"Writer process is unavailable at {self.host}:{self.port}")
+
+        message_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        try:
+            self._writer.write(json.dumps({"id": message_id, "op": op, **payload}).encode() + b"\n")
+            await self._writer.drain()
+            reply = await future
+        except ConnectionError as e:
+            raise WriterError("Writer connection lost") from e
+        finally:
+            self._pending.pop(message_id, None)
+
+        if reply["ok"]:
+            return reply["complaint"]
+        if reply["error"] == "not_found":
+            raise LookupError(reply["detail"])
+        raise WriterError(reply["detail"])
+
+    async def _open(self):
+        self._reader, self._writer = await asyncio.open_connection(
+            self.host, self.port, limit=self.STREAM_LIMIT
+        )
+        self._listener = asyncio.create_task(self._listen())
+        if self.on_connect is not None:
+            await self.on_connect()
+
+    async def _reconnect(self):
+        """Переподключается в фоне с экспоненциальной задержкой между попытками."""
+        delay = self.CONNECT_RETRY_DELAY
+        while not self._closed:
+            await asyncio.sleep(delay)
+            try:
+                await self._open()
+                print(f"Reconnected to writer process at {self.host}:{self.port}")
+                return
+            except Exception as e:
+                print("Writer reconnect failed:", e)
+                if self._listener is not None:
+                    self._listener.cancel()
+                if self._writer is not None:
+                    self._writer.close()
+                    self._writer = None
+                delay = min(delay * 2, self.RECONNECT_MAX_DELAY)
+
+    async def _listen(self):
+        try:
+            while line := await self._reader.readline():
+                message = json.loads(line)
+                if "event" in message:
+                    if self.on_event is not None:
+                        self.on_event(message["complaint"])
+                    continue
+
+                future = self._pending.get(message["id"])
+                if future is not None and not future.done():
+                    future.set_result(message)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(WriterError("Writer connection lost"))
+            if self.on_disconnect is not None:
+                self.on_disconnect()
+            if not self._closed and (self._reconnector is None or self._reconnector.done()):
+                self._reconnector = asyncio.create_task(self._reconnect())
+
+writer_client = WriterClient(
+    host=settings.WRITER_HOST,
+    port=settings.WRITER_PORT,
+    enabled=settings.MULTI_WORKER
+)
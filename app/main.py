@@ -2,21 +2,45 @@
 Главный модуль приложения FastAPI.
 
 Здесь выполняется:
-- Инициализация базы данных при запуске приложения (через lifespan).
-- Регистрация маршрутов (в данном случае — маршруты жалоб из routers.complant).
+- Инициализация базы данных и in-memory индекса открытых жалоб при запуске приложения (через lifespan).
+  В многопроцессном режиме (MULTI_WORKER) вместо создания таблиц воркер подключается к процессу
+  записи database.writer и получает от него события для индекса.
+- Регистрация маршрутов (маршруты жалоб из routers.complant и служебные маршруты из routers.admin).
+- Подключение middleware записи медленных запросов (core.profiling).
 """
 
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
-from routers import complant
-from database.db import init_db
+from core.profiling import SlowRequestMiddleware
+from routers import admin, complant
+from database.db import init_db, AsyncSessionLocal
+from database.models import warm_open_complaints_index, apply_complaint_event
+from database.open_index import open_complaints_index
+from database.writer_client import writer_client
+
+
+async def warm_index():
+    async with AsyncSessionLocal() as db:
+        await warm_open_complaints_index(db)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    await init_db()
+    if writer_client.enabled:
+        # Пока соединения с процессом записи нет, события теряются: индекс сбрасывается
+        # и заново заполняется из БД после переподключения
+        writer_client.on_event = apply_complaint_event
+        writer_client.on_disconnect = open_complaints_index.reset
+        writer_client.on_connect = warm_index
+        await writer_client.connect()
+    else:
+        await init_db()
+        await warm_index()
     yield
+    await writer_client.close()
 
 app = FastAPI(lifespan=lifespan)
+app.add_middleware(SlowRequestMiddleware)
 app.include_router(complant.router)
+app.include_router(admin.router)
@@ -0,0 +1,132 @@
+"""
+Модуль служебных маршрутов FastAPI для диагностики производительности.
+
+Функционал:
+- Запуск семплирующего профайлера на фиксированное время (ответ в формате collapsed stacks
+  для построения flamegraph).
+- Получение и очистка буфера медленных запросов.
+- Статистика in-memory индекса открытых жалоб и его сверка с базой данных.
+
+Все защищено API-ключом через заголовок `complaint-api-key`.
+
+Профайлер, буфер медленных запросов и индекс — свои в каждом процессе. При запуске
+с несколькими воркерами (uvicorn --workers N) запрос попадает в произвольный воркер,
+поэтому в каждом ответе указан pid ответившего процесса.
+"""
+
+import os
+
+from fastapi import APIRouter, HTTPException, Depends, Header, Query
+from fastapi.responses import PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from core.config import settings
+from core.profiling import profiler, slow_request_recorder, ProfilerBusyError
+from database.db import get_db
+from database.models import check_open_complaints_index
+from database.open_index import open_complaints_index
+
+
+router = APIRouter()
+
+
+@router.post("/admin/profile", response_class=PlainTextResponse)
+async def run_profiler(
+        duration: float = Query(10, gt=0, le=settings.PROFILER_MAX_DURATION, description="Длительность профилирования (секунды)"),
+        interval_ms: float = Query(5, ge=1, le=1000, description="Интервал семплирования (мс)"),
+        all_threads: bool = Query(False, description="Семплировать все потоки, а не только event loop"),
+        apikey: str = Header(..., alias="complaint-api-key"),
+    ):
+    """
+    Запустить семплирующий профайлер на duration секунд.
+
+    Возвращает стеки в формате collapsed stacks ('frame;frame;frame count'),
+    пригодном для flamegraph.pl / speedscope. Одновременно допускается только одна сессия.
+    Профилируется только ответивший воркер (заголовок X-Worker-Pid).
+
+    Требуется API-ключ.
+    """
+    if apikey != settings.COMPLAINT_API_KEY:
+        raise HTTPException(status_code=401, detail="Invalid API Key")
+
+    try:
+        collapsed, samples = await profiler.profile(duration, interval_ms / 1000, all_threads)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+    return PlainTextResponse(
+        collapsed,
+        headers={"X-Profile-Samples": str(samples), "X-Worker-Pid": str(os.getpid())}
+    )
+
+
+@router.get("/admin/slow-requests")
+async def get_slow_requests(
+        apikey: str = Header(..., alias="complaint-api-key"),
+    ):
+    """
+    Получить медленные запросы (от самого нового к самому старому).
+
+    Требуется API-ключ.
+    """
+    if apikey != settings.COMPLAINT_API_KEY:
+        raise HTTPException(status_code=401, detail="Invalid API Key")
+
+    return {
+        "pid": os.getpid(),
+        "threshold_ms": slow_request_recorder.threshold_ms,
+        "requests": slow_request_recorder.records()
+    }
+
+
+@router.delete("/admin/slow-requests")
+async def clear_slow_requests(
+        apikey: str = Header(..., alias="complaint-api-key"),
+    ):
+    """
+    Очистить буфер медленных запросов.
+
+    Требуется API-ключ.
+    """
+    if apikey != settings.COMPLAINT_API_KEY:
+        raise HTTPException(status_code=401, detail="Invalid API Key")
+
+    slow_request_recorder.clear()
+    return {"pid": os.getpid(), "cleared": True}
+
+
+@router.get("/admin/open-index")
+async def get_open_index_stats(
+        apikey: str = Header(..., alias="complaint-api-key"),
+    ):
+    """
+    Получить статистику in-memory индекса открытых жалоб.
+
+    Требуется API-ключ.
+    """
+    if apikey != settings.COMPLAINT_API_KEY:
+        raise HTTPException(status_code=401, detail="Invalid API Key")
+
+    open_complaints_index.evict()
+    return {"pid": os.getpid(), **open_complaints_index.stats()}
+
+
+@router.post("/admin/open-index/check")
+async def check_open_index(
+        repair: bool = Query(False, description="Пересобрать индекс из БД при расхождении"),
+        apikey: str = Header(..., alias="complaint-api-key"),
+        db: AsyncSession = Depends(get_db)
+    ):
+    """
+    Сверить in-memory индекс открытых жалоб с базой данных.
+
+    Требуется API-ключ.
+    """
+    if apikey != settings.COMPLAINT_API_KEY:
+        raise HTTPException(status_code=401, detail="Invalid API Key")
+
+    try:
+        report = await check_open_complaints_index(db, repair=repair)
+        return {"pid": os.getpid(), **report}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
@@ -18,6 +18,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
 
 from core.config import settings
+from core.profiling import profile_phase
 from database.db import get_db
 from database.models import create_complaint_record, update_complaint_category, get_recent_open_complaint_records, close_complaint_status
 from database.models import StatusEnum
@@ -68,6 +69,8 @@ async def get_recent_open_complaints(
     """
     Получить все жалобы со статусом 'open' за последний час.
 
+    Ответ формируется из in-memory индекса открытых жалоб, если он покрывает период.
+
     Требуется API-ключ.
     """
     if apikey != settings.COMPLAINT_API_KEY:
@@ -118,16 +121,20 @@ async def create_complaint(request: ComplantInput, db: AsyncSession = Depends(ge
         category_task = asyncio.create_task(complaint_category_analyze(complaint_text))
 
         # Ждём ответа sentiment (нужен для создания записи в БД)
-        sentiment = await sentiment_task
-        complaint = await create_complaint_record(db, sentiment, complaint_text)
+        with profile_phase("sentiment_wait"):
+            sentiment = await sentiment_task
+        with profile_phase("db_create"):
+            complaint = await create_complaint_record(db, sentiment, complaint_text)
 
         # Ждём категорию (можно уже после создания complaint)
-        complaint_analyze = await category_task
-        updated_complaint = await update_complaint_category(
-            db=db,
-            complaint_id=complaint.id,
-            new_category=complaint_analyze
-        )
+        with profile_phase("category_wait"):
+            complaint_analyze = await category_task
+        with profile_phase("db_update_category"):
+            updated_complaint = await update_complaint_category(
+                db=db,
+                complaint_id=complaint.id,
+                new_category=complaint_analyze
+            )
 
         return ComplaintResponse(
             id=updated_complaint.id,
@@ -0,0 +1,41 @@
+@echo off
+setlocal
+
+REM Указываем путь к виртуальному окружению и количество воркеров
+set VENV_PATH=..\env
+set ACTIVATE_SCRIPT=%VENV_PATH%\Scripts\activate.bat
+if "%WORKERS%"=="" set WORKERS=4
+
+REM Проверяем наличие виртуального окружения
+if not exist "%ACTIVATE_SCRIPT%" (
+    echo No env found "%VENV_PATH%".
+    echo create it with:
+    echo python -m venv env
+    pause
+    exit /b
+)
+
+REM Активируем виртуальное окружение
+call "%ACTIVATE_SCRIPT%"
+echo "%ACTIVATE_SCRIPT%"
+
+REM Проверяем наличие uvicorn
+where uvicorn >nul 2>nul
+IF ERRORLEVEL 1 (
+    echo Uvicorn не найден. Устанавливаю зависимости...
+    pip install fastapi uvicorn
+)
+
+REM Многопроцессный режим: воркеры только читают БД, запись выполняет отдельный процесс
+set MULTI_WORKER=true
+
+REM Запуск процесса записи
+echo Running writer process...
+start "complaint-writer" python -m database.writer
+
+REM Запуск сервера (--reload несовместим с --workers)
+echo Running main APP with %WORKERS% workers...
+uvicorn main:app --host 127.0.0.1 --port 8000 --workers %WORKERS%
+
+endlocal
+pause
@@ -0,0 +1,194 @@
+"""
+Бенчмарк масштабирования пропускной способности по количеству воркеров.
+
+Для каждого варианта поднимается свежая временная БД, процесс записи (database.writer)
+и uvicorn с N воркерами в многопроцессном режиме (MULTI_WORKER). Строка "single" — исходный
+однопроцессный режим без процесса записи, для сравнения. Mock-сервисы внешних API (mock_api/)
+запускаются один раз с несколькими воркерами, чтобы не ограничивать пропускную способность.
+
+Нагрузка — смесь POST /complaints/ (создание жалобы: два внешних API и две записи)
+и GET /complaints/open-recent (чтение). Каждая доля чтений из --read-ratios прогоняется отдельно:
+0 — только запись (измеряет процесс записи и пачки), больше 0 — добавляет чтения из in-memory индекса.
+
+Запуск (из корня репозитория, в активированном окружении):
+    python benchmarks/bench_workers.py --workers 1 2 4 --duration 10 --concurrency 64 --read-ratios 0 0.2
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+
+ROOT = Path(__file__).resolve().parent.parent
+APP_DIR = ROOT / "app"
+MOCK_DIR = ROOT / "mock_api"
+API_KEY = "api-debug"
+HEADERS = {"complaint-api-key": API_KEY}
+TEXTS = ["тест !оплата bad", "тест !техническая", "тест !другое love", "тест ok"]
+
+
+def start(module_args: list[str], cwd: Path, env: dict = None) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", *module_args],
+        cwd=cwd,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+
+def stop(processes: list[subprocess.Popen]):
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def uvicorn_args(app: str, port: int, workers: int) -> list[str]:
+    return [
+        "uvicorn", app,
+        "--host", "127.0.0.1",
+        "--port", str(port),
+        "--workers", str(workers),
+        "--log-level", "warning"
+    ]
+
+
+def open_recent_params() -> dict:
+    return {"current_time": datetime.now(timezone.utc).replace(tzinfo=None).isoformat()}
+
+
+async def wait_ready(base_url: str, timeout: float = 60):
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                response = await client.get(
+                    f"{base_url}/complaints/open-recent", params=open_recent_params(), headers=HEADERS
+                )
+                if response.status_code == 200:
+                    return
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.5)
+    raise RuntimeError(f"{base_url} did not become ready in {timeout} seconds")
+
+
+async def run_load(base_url: str, duration: float, concurrency: int, read_ratio: float) -> dict:
+    latencies = []
+    errors = 0
+
+    async with httpx.AsyncClient(
+            base_url=base_url,
+            timeout=30,
+            limits=httpx.Limits(max_connections=concurrency)
+        ) as client:
+        deadline = time.monotonic() + duration
+
+        async def user(seed: int):
+            nonlocal errors
+            rnd = random.Random(seed)
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    if rnd.random() < read_ratio:
+                        response = await client.get(
+                            "/complaints/open-recent", params=open_recent_params(), headers=HEADERS
+                        )
+                    else:
+                        response = await client.post("/complaints/", json={"text": rnd.choice(TEXTS)})
+                    response.raise_for_status()
+                    latencies.append(time.perf_counter() - started)
+                except httpx.HTTPError:
+                    errors += 1
+
+        await asyncio.gather(*(user(seed) for seed in range(concurrency)))
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / duration,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99_ms": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000 if latencies else 0.0
+    }
+
+
+def bench(workers: int, multi_worker: bool, read_ratio: float, args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_PATH": str(Path(tmp) / "complaints.db"),
+            "MULTI_WORKER": str(multi_worker).lower(),
+            "WRITER_PORT": str(args.writer_port)
+        }
+        base_url = f"http://127.0.0.1:{args.port}"
+        processes = []
+        try:
+            if multi_worker:
+                processes.append(start(["database.writer"], APP_DIR, env))
+            processes.append(start(uvicorn_args("main:app", args.port, workers), APP_DIR, env))
+            asyncio.run(wait_ready(base_url))
+            return asyncio.run(run_load(base_url, args.duration, args.concurrency, read_ratio))
+        finally:
+            stop(processes)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4], help="Количество воркеров uvicorn")
+    parser.add_argument("--duration", type=float, default=10, help="Длительность нагрузки на вариант (секунды)")
+    parser.add_argument("--concurrency", type=int, default=64, help="Количество одновременных клиентов")
+    parser.add_argument(
+        "--read-ratios", type=float, nargs="+", default=[0.0, 0.2],
+        help="Доли запросов на чтение; каждая прогоняется отдельно (0 — только запись)"
+    )
+    parser.add_argument("--mock-workers", type=int, default=4, help="Количество воркеров mock-сервисов")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--writer-port", type=int, default=8110)
+    parser.add_argument("--no-single", action="store_true", help="Не запускать однопроцессный вариант")
+    args = parser.parse_args()
+
+    mocks = [
+        start(uvicorn_args("mock_sentiment_api:mock_app", 8001, args.mock_workers), MOCK_DIR),
+        start(uvicorn_args("mock_open_ai_api:mock_app", 8002, args.mock_workers), MOCK_DIR)
+    ]
+    try:
+        variants = ([] if args.no_single else [("single", 1, False)]) + [("multi", n, True) for n in args.workers]
+        results = []
+        for read_ratio in args.read_ratios:
+            for mode, workers, multi_worker in variants:
+                result = bench(workers, multi_worker, read_ratio, args)
+                results.append((read_ratio, mode, workers, result))
+                print(f"reads={read_ratio:.0%} {mode:>6} workers={workers}: {result['rps']:.1f} req/s", file=sys.stderr)
+    finally:
+        stop(mocks)
+
+    print(f"CPU cores: {os.cpu_count()}, concurrency: {args.concurrency}, duration: {args.duration}s")
+    print(f"{'reads':>5} {'mode':>6} {'workers':>7} {'req/s':>9} {'speedup':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+    for read_ratio in args.read_ratios:
+        rows = [row for row in results if row[0] == read_ratio]
+        baseline = next((result["rps"] for _, mode, _, result in rows if mode == "multi"), None)
+        for _, mode, workers, result in rows:
+            speedup = result["rps"] / baseline if baseline else 0.0
+            print(
+                f"{read_ratio:>5.0%} {mode:>6} {workers:>7} {result['rps']:>9.1f} {speedup:>7.2f}x "
+                f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['errors']:>7}"
+            )
+
+
+if __name__ == "__main__":
+    main()